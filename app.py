@@ -11,10 +11,18 @@ import graphviz
 import json
 import os
 import re
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
+import numpy as np
 import pandas as pd
 
+try:
+    import orjson
+except ImportError:  # Fall back to the stdlib json module
+    orjson = None
+
 # Page configuration
 st.set_page_config(
     page_title="Course Flowchart",
@@ -45,21 +53,99 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 
-def natural_sort_key(text: str):
+_DIGIT_RE = re.compile(r'(\d+)')
+
+
+@lru_cache(maxsize=4096)
+def natural_sort_key(text: str) -> tuple:
     """Generate a sort key that handles embedded numbers naturally.
 
     E.g., "CHEM 4000" sorts before "CHEM 4523" instead of after.
+    Keys are memoized since the same course IDs are sorted repeatedly.
     """
-    parts = re.split(r'(\d+)', text)
-    return [int(part) if part.isdigit() else part.lower() for part in parts]
+    parts = _DIGIT_RE.split(text)
+    return tuple(int(part) if part.isdigit() else part.lower() for part in parts)
+
+
+def _parse_json(raw: bytes) -> dict:
+    """Parse JSON bytes, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _format_json(data: dict) -> str:
+    """Serialize data as 2-space indented JSON, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(data, indent=2)
+
+
+@st.cache_data
+def _read_program_file(file_path: str, mtime: float) -> dict:
+    """Parse a program JSON file (mtime is part of the cache key)."""
+    return _parse_json(Path(file_path).read_bytes())
 
 
 def load_program_data(file_path: str) -> dict:
-    """Load program data from a JSON file."""
-    with open(file_path, 'r') as f:
-        return json.load(f)
+    """Load program data from a JSON file.
+
+    Parsed results are cached across reruns and re-read when the file's
+    modification time changes.
+    """
+    return _read_program_file(file_path, os.path.getmtime(file_path))
+
+
+# Manifest of program listing metadata: filename -> {"mtime", "program"}.
+# "program" is the get_available_programs entry, or None for non-program files.
+# Not a .json name, so neither the data/*.json scan nor the editor's Save to
+# Server (which always writes <name>.json) can reach it.
+PROGRAM_MANIFEST = Path("data") / ".program-index"
+
+
+def _program_summary(filename_str: str, data: dict) -> Optional[dict]:
+    """Return the listing metadata for a program file, or None if it is not one."""
+    # Verify it looks like a program file (has required fields)
+    if not isinstance(data, dict) or "major" not in data or "courses" not in data:
+        return None
+    return {
+        "filename": filename_str,
+        "institution": data.get("institution", "Unknown Institution"),
+        "college": data.get("college", ""),
+        "department": data.get("department", "Unknown Department"),
+        "major": data.get("major", filename_str)
+    }
+
+
+def _load_program_manifest() -> dict:
+    """Read the program manifest, or return an empty one if missing or invalid."""
+    try:
+        manifest = _parse_json(PROGRAM_MANIFEST.read_bytes())
+    except (OSError, json.JSONDecodeError):
+        return {}
+    return manifest if isinstance(manifest, dict) else {}
 
 
+def _save_program_manifest(manifest: dict):
+    """Write the program manifest; it is only a cache, so write errors are ignored."""
+    try:
+        PROGRAM_MANIFEST.write_text(_format_json(manifest), encoding='utf-8')
+    except OSError:
+        pass
+
+
+def update_program_manifest(file_path: str, data: dict):
+    """Record a just-written program file in the manifest."""
+    filename_str = str(Path(file_path))
+    manifest = _load_program_manifest()
+    manifest[filename_str] = {
+        "mtime": os.path.getmtime(filename_str),
+        "program": _program_summary(filename_str, data)
+    }
+    _save_program_manifest(manifest)
+
+
+@st.cache_data(ttl=300)
 def get_available_programs() -> list[dict]:
     """Find all JSON program files in the current directory.
 
@@ -69,118 +155,292 @@ def get_available_programs() -> list[dict]:
     - college: college name
     - department: department name
     - major: program/major name
+
+    Metadata comes from PROGRAM_MANIFEST; only files that are new or whose
+    modification time changed are parsed, and the manifest is refreshed.
     """
+    manifest = _load_program_manifest()
+    updated_manifest = {}
     programs = []
     # Find all JSON files in the data directory
     for filename in Path("data").glob("*.json"):
         filename_str = str(filename)
-        # Skip hidden files and non-program files
-        if filename_str.startswith("."):
+        # Skip hidden files and the manifest itself
+        if filename.name.startswith(".") or filename == PROGRAM_MANIFEST:
             continue
         try:
-            data = load_program_data(filename_str)
-            # Verify it looks like a program file (has required fields)
-            if "major" in data and "courses" in data:
-                programs.append({
-                    "filename": filename_str,
-                    "institution": data.get("institution", "Unknown Institution"),
-                    "college": data.get("college", ""),
-                    "department": data.get("department", "Unknown Department"),
-                    "major": data.get("major", filename_str)
-                })
-        except (json.JSONDecodeError, KeyError):
+            mtime = filename.stat().st_mtime
+        except OSError:
             continue
+
+        entry = manifest.get(filename_str)
+        if not isinstance(entry, dict) or entry.get("mtime") != mtime:
+            try:
+                data = _parse_json(filename.read_bytes())
+            except OSError:
+                continue
+            except json.JSONDecodeError:
+                data = None
+            entry = {"mtime": mtime, "program": _program_summary(filename_str, data)}
+
+        updated_manifest[filename_str] = entry
+        if entry.get("program"):
+            programs.append(entry["program"])
+
+    if updated_manifest != manifest:
+        _save_program_manifest(updated_manifest)
     return programs
 
 
-def calculate_critical_path(courses: list[dict]) -> dict:
+def _cached_programs() -> list[dict]:
+    """Return get_available_programs(), kept in session state between reruns.
+
+    Cleared by the editor's Save to Server branch so new files show up, and
+    when a listed file can no longer be read.
     """
-    Calculate critical path metrics for all courses.
+    if "available_programs" not in st.session_state:
+        st.session_state.available_programs = get_available_programs()
+    return st.session_state.available_programs
 
-    Returns a dict with course_id -> {depth, height, earliest_semester, is_critical}
+
+def _forget_cached_programs():
+    """Drop the cached program list so the next rerun rescans the data directory."""
+    get_available_programs.clear()
+    if "available_programs" in st.session_state:
+        del st.session_state.available_programs
+
+
+@dataclass(frozen=True)
+class ProgramIndex:
+    """Lookup structures derived once from a program's course list.
+
+    - course_map: course_id -> course dict
+    - prereq_map: course_id -> prerequisite ids that exist in the program
+    - dependents_map: course_id -> ids of courses that list it as a prerequisite
+    - course_ids: course ids by integer position, in program order
+    - prereq_indptr/prereq_indices: prereq_map as CSR arrays over positions
+    - dependents_indptr/dependents_indices: dependents_map as CSR arrays
+    """
+    course_map: dict[str, dict]
+    prereq_map: dict[str, list[str]]
+    dependents_map: dict[str, list[str]]
+    course_ids: list[str]
+    prereq_indptr: np.ndarray
+    prereq_indices: np.ndarray
+    dependents_indptr: np.ndarray
+    dependents_indices: np.ndarray
+
+
+def _build_csr(adjacency: list[list[int]]) -> tuple[np.ndarray, np.ndarray]:
+    """Pack integer adjacency lists into CSR (indptr, indices) arrays."""
+    counts = np.fromiter((len(neighbors) for neighbors in adjacency), dtype=np.int32, count=len(adjacency))
+    indptr = np.zeros(len(adjacency) + 1, dtype=np.int32)
+    np.cumsum(counts, out=indptr[1:])
+    indices = np.fromiter(
+        (n for neighbors in adjacency for n in neighbors),
+        dtype=np.int32,
+        count=int(indptr[-1])
+    )
+    return indptr, indices
+
+
+def _gather_neighbors(indptr: np.ndarray, indices: np.ndarray, nodes: np.ndarray) -> np.ndarray:
+    """Concatenate the CSR neighbor lists of nodes without a Python loop."""
+    starts = indptr[nodes]
+    counts = indptr[nodes + 1] - starts
+    # Shift each output run from its offset in the result to its start in indices
+    shift = np.repeat(starts - (np.cumsum(counts) - counts), counts)
+    return indices[shift + np.arange(int(counts.sum()))]
+
+
+def _csr_from_edges(sources: np.ndarray, targets: np.ndarray, node_count: int) -> tuple[np.ndarray, np.ndarray]:
+    """Build CSR (indptr, indices) arrays from parallel edge source/target arrays."""
+    indptr = np.zeros(node_count + 1, dtype=np.int32)
+    np.cumsum(np.bincount(sources, minlength=node_count), out=indptr[1:])
+    indices = targets[np.argsort(sources, kind="stable")].astype(np.int32)
+    return indptr, indices
+
+
+def _strongly_connected_components(indptr: np.ndarray, indices: np.ndarray) -> np.ndarray:
+    """Label each node with its strongly connected component (iterative Tarjan)."""
+    node_count = len(indptr) - 1
+    indptr = indptr.tolist()
+    indices = indices.tolist()
+    order = [-1] * node_count
+    low = [0] * node_count
+    on_stack = [False] * node_count
+    component = [-1] * node_count
+    stack = []
+    counter = 0
+    comp_count = 0
+
+    for root in range(node_count):
+        if order[root] != -1:
+            continue
+        order[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = True
+        work = [(root, indptr[root])]
+        while work:
+            node, pos = work[-1]
+            if pos < indptr[node + 1]:
+                work[-1] = (node, pos + 1)
+                next_node = indices[pos]
+                if order[next_node] == -1:
+                    order[next_node] = low[next_node] = counter
+                    counter += 1
+                    stack.append(next_node)
+                    on_stack[next_node] = True
+                    work.append((next_node, indptr[next_node]))
+                elif on_stack[next_node]:
+                    low[node] = min(low[node], order[next_node])
+                continue
+
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                low[parent] = min(low[parent], low[node])
+            if low[node] == order[node]:
+                # node is the root of a component; pop its members
+                while True:
+                    member = stack.pop()
+                    on_stack[member] = False
+                    component[member] = comp_count
+                    if member == node:
+                        break
+                comp_count += 1
+
+    return np.array(component, dtype=np.int32)
+
+
+def _longest_chain_lengths(
+    in_indptr: np.ndarray,
+    in_indices: np.ndarray,
+    out_indptr: np.ndarray,
+    out_indices: np.ndarray
+) -> np.ndarray:
+    """Length of the longest chain of in-edges leading to each node.
+
+    Layered Kahn's algorithm: nodes with no remaining in-edges are peeled off
+    one frontier at a time, so each node's layer is one more than the deepest
+    of its in-neighbors. Python loops once per layer; per-edge work is NumPy.
     """
+    node_count = len(in_indptr) - 1
+    remaining = np.diff(in_indptr)
+    layer = np.full(node_count, -1, dtype=np.int32)
+
+    frontier = np.flatnonzero(remaining == 0)
+    level = 0
+    while frontier.size:
+        layer[frontier] = level
+        targets = _gather_neighbors(out_indptr, out_indices, frontier)
+        np.subtract.at(remaining, targets, 1)
+        targets = np.unique(targets)
+        frontier = targets[remaining[targets] == 0]
+        level += 1
+
+    # Nodes on or behind a prerequisite cycle never run out of in-edges.
+    # Collapse each cycle (strongly connected component) into one node and
+    # layer the resulting acyclic graph; every member of a cycle then gets
+    # its component's value, independent of course order.
+    if (layer < 0).any():
+        component = _strongly_connected_components(out_indptr, out_indices)
+        sources = np.repeat(np.arange(node_count, dtype=np.int32), np.diff(out_indptr))
+        source_comp = component[sources]
+        target_comp = component[out_indices]
+        between = source_comp != target_comp
+        source_comp = source_comp[between]
+        target_comp = target_comp[between]
+
+        comp_count = int(component.max()) + 1
+        comp_out_indptr, comp_out_indices = _csr_from_edges(source_comp, target_comp, comp_count)
+        comp_in_indptr, comp_in_indices = _csr_from_edges(target_comp, source_comp, comp_count)
+        comp_layer = _longest_chain_lengths(comp_in_indptr, comp_in_indices, comp_out_indptr, comp_out_indices)
+        layer = comp_layer[component]
+
+    return layer
+
+
+def build_program_index(courses: list[dict]) -> ProgramIndex:
+    """Build the ProgramIndex for a course list in O(V+E)."""
     course_map = {c["id"]: c for c in courses}
-    metrics = {}
 
-    # Calculate depth (longest chain of prerequisites to reach this course)
-    def calc_depth(course_id: str, visited: set = None) -> int:
-        if visited is None:
-            visited = set()
-        if course_id in visited:
-            return 0
-        visited.add(course_id)
+    # Build forward (prerequisite) and reverse (dependent) adjacency once
+    prereq_map: dict[str, list[str]] = {
+        c["id"]: [p for p in c.get("prerequisites", []) if p in course_map]
+        for c in courses
+    }
+    dependents_map: dict[str, list[str]] = {course_id: [] for course_id in course_map}
+    for course_id, prereq_ids in prereq_map.items():
+        for prereq_id in prereq_ids:
+            dependents_map[prereq_id].append(course_id)
+
+    # Integer positions and CSR adjacency for the vectorized path calculations
+    course_ids = list(course_map)
+    position = {course_id: i for i, course_id in enumerate(course_ids)}
+    prereq_indptr, prereq_indices = _build_csr(
+        [[position[p] for p in prereq_map[course_id]] for course_id in course_ids]
+    )
+    dependents_indptr, dependents_indices = _build_csr(
+        [[position[d] for d in dependents_map[course_id]] for course_id in course_ids]
+    )
 
-        course = course_map.get(course_id)
-        if not course or not course.get("prerequisites"):
-            return 0
+    return ProgramIndex(
+        course_map,
+        prereq_map,
+        dependents_map,
+        course_ids,
+        prereq_indptr,
+        prereq_indices,
+        dependents_indptr,
+        dependents_indices
+    )
 
-        max_prereq_depth = 0
-        for prereq_id in course["prerequisites"]:
-            if prereq_id in course_map:
-                prereq_depth = calc_depth(prereq_id, visited.copy())
-                max_prereq_depth = max(max_prereq_depth, prereq_depth + 1)
 
-        return max_prereq_depth
+def calculate_critical_path(index: ProgramIndex) -> dict:
+    """
+    Calculate critical path metrics for all courses.
 
-    # Calculate height (longest chain of courses dependent on this one)
-    def calc_height(course_id: str, visited: set = None) -> int:
-        if visited is None:
-            visited = set()
-        if course_id in visited:
-            return 0
-        visited.add(course_id)
+    Returns a dict with course_id -> {depth, height, earliest_semester, is_critical}
+    Courses on a prerequisite cycle are treated as a single course, so every
+    member of the cycle gets the same metrics.
+    """
+    metrics = {}
 
-        max_dep_height = 0
-        for c in courses:
-            if course_id in c.get("prerequisites", []):
-                dep_height = calc_height(c["id"], visited.copy())
-                max_dep_height = max(max_dep_height, dep_height + 1)
+    # Calculate depth (longest chain of prerequisites to reach this course)
+    depth = _longest_chain_lengths(
+        index.prereq_indptr, index.prereq_indices,
+        index.dependents_indptr, index.dependents_indices
+    )
 
-        return max_dep_height
+    # Calculate height (longest chain of courses dependent on this one)
+    height = _longest_chain_lengths(
+        index.dependents_indptr, index.dependents_indices,
+        index.prereq_indptr, index.prereq_indices
+    )
 
-    # Calculate metrics for each course
-    for course in courses:
-        course_id = course["id"]
-        depth = calc_depth(course_id)
-        height = calc_height(course_id)
-        earliest_semester = depth + 1  # 1-indexed
+    # Critical path: courses whose longest chain through them is the longest
+    path_length = depth + height
+    critical_length = path_length.max() if path_length.size else 0
+    is_critical = path_length == critical_length
 
+    # Calculate metrics for each course
+    for course_id, course_depth, course_height, course_path_length, course_is_critical in zip(
+        index.course_ids, depth.tolist(), height.tolist(), path_length.tolist(), is_critical.tolist()
+    ):
         metrics[course_id] = {
-            "depth": depth,
-            "height": height,
-            "earliest_semester": earliest_semester,
-            "path_length": depth + height
+            "depth": course_depth,
+            "height": course_height,
+            "earliest_semester": course_depth + 1,  # 1-indexed
+            "path_length": course_path_length,
+            "is_critical": course_is_critical
         }
 
-    # Find critical path length (maximum path_length)
-    if metrics:
-        critical_length = max(m["path_length"] for m in metrics.values())
-
-        # Mark courses on critical path
-        for course_id, m in metrics.items():
-            m["is_critical"] = (m["path_length"] == critical_length)
-
     return metrics
 
 
-def get_semester_color(semester: int, max_semester: int = 8) -> str:
-    """Generate a color for a semester (light to dark orange gradient)."""
-    # Orange gradient from light to dark
-    colors = [
-        "#FFF4E6",  # Semester 1 - lightest
-        "#FFE4CC",  # Semester 2
-        "#FFD4B3",  # Semester 3
-        "#FFC499",  # Semester 4
-        "#FFB480",  # Semester 5
-        "#FFA366",  # Semester 6
-        "#FF934D",  # Semester 7
-        "#FF8333",  # Semester 8 - darkest
-    ]
-    idx = min(semester - 1, len(colors) - 1)
-    return colors[max(0, idx)]
-
-
-def get_contrast_text_color(hex_color: str) -> str:
+def _luminance_text_color(hex_color: str) -> str:
     """Return black or white text color based on background luminance."""
     # Remove # prefix
     hex_color = hex_color.lstrip('#')
@@ -197,46 +457,142 @@ def get_contrast_text_color(hex_color: str) -> str:
     return "#000000" if luminance > 0.5 else "#FFFFFF"
 
 
-def create_flowchart(
-    program_data: dict,
-    metrics: dict,
-    selected_course: Optional[str] = None,
-    show_critical_path: bool = False
-) -> graphviz.Digraph:
-    """Create a Graphviz flowchart for the program."""
-
-    dot = graphviz.Digraph(
-        comment=program_data["major"],
-        format='svg'
+# Orange gradient from light to dark
+_SEMESTER_COLORS: tuple[str, ...] = (
+    "#FFF4E6",  # Semester 1 - lightest
+    "#FFE4CC",  # Semester 2
+    "#FFD4B3",  # Semester 3
+    "#FFC499",  # Semester 4
+    "#FFB480",  # Semester 5
+    "#FFA366",  # Semester 6
+    "#FF934D",  # Semester 7
+    "#FF8333",  # Semester 8 - darkest
+)
+# Text color for each semester background, computed once at import
+_SEMESTER_TEXT_COLORS: tuple[str, ...] = tuple(_luminance_text_color(c) for c in _SEMESTER_COLORS)
+
+
+def _semester_color_index(semester: int) -> int:
+    """Clamp a 1-indexed semester to a palette index."""
+    return max(0, min(semester - 1, len(_SEMESTER_COLORS) - 1))
+
+
+def get_semester_style(semester: int) -> tuple[str, str]:
+    """Return the (background, text) colors for a semester."""
+    idx = _semester_color_index(semester)
+    return _SEMESTER_COLORS[idx], _SEMESTER_TEXT_COLORS[idx]
+
+
+# Edge (color, penwidth) keyed by (show_critical_path, is_selected, is_critical).
+# Critical-path highlighting wins over selection; with the critical path shown,
+# other edges are dimmed but keep the selected penwidth.
+_EDGE_STYLES: dict[tuple[bool, bool, bool], tuple[str, str]] = {
+    (False, False, False): ("#9CA3AF", "1"),  # Lighter gray for dark background
+    (False, False, True): ("#9CA3AF", "1"),
+    (False, True, False): ("#FE5C00", "2"),  # OSU Orange
+    (False, True, True): ("#FE5C00", "2"),
+    (True, False, False): ("#4B5563", "1"),  # Dimmed gray for dark background
+    (True, True, False): ("#4B5563", "2"),
+    (True, False, True): ("#EF4444", "2"),  # Red for critical path
+    (True, True, True): ("#EF4444", "2"),
+}
+
+
+def _node_style(
+    sem_idx: int,
+    is_critical: bool,
+    is_selected: bool,
+    show_critical_path: bool
+) -> tuple[str, str, str, str]:
+    """Return a course node's (fill, border, font, penwidth) styling."""
+    bg_color = _SEMESTER_COLORS[sem_idx]
+    border_color = "#6B7280"  # Medium gray for dark background
+    font_color = "#333333"
+    penwidth = "1"
+
+    # Highlight selected course
+    if is_selected:
+        border_color = "#FE5C00"  # OSU Orange
+        penwidth = "3"
+
+    # Dim non-critical courses if critical path is shown
+    if show_critical_path and not is_critical:
+        bg_color = "#374151"  # Dark gray for dark background
+        font_color = "#9CA3AF"  # Light gray text
+        border_color = "#4B5563"
+    elif show_critical_path and is_critical:
+        border_color = "#EF4444"  # Red for critical path
+        penwidth = "2"
+
+    return bg_color, border_color, font_color, penwidth
+
+
+# Node styling for every (sem_idx, is_critical, is_selected, show_critical_path)
+_STYLE_TABLE: dict[tuple[int, bool, bool, bool], tuple[str, str, str, str]] = {
+    (sem_idx, is_critical, is_selected, show_critical_path): _node_style(
+        sem_idx, is_critical, is_selected, show_critical_path
     )
+    for sem_idx in range(len(_SEMESTER_COLORS))
+    for is_critical in (False, True)
+    for is_selected in (False, True)
+    for show_critical_path in (False, True)
+}
 
-    # Graph attributes for top-to-bottom layout
-    dot.attr(
-        rankdir='TB',
-        splines='ortho',
-        nodesep='0.5',
-        ranksep='0.8',
-        bgcolor='#0e1117',  # Match Streamlit dark mode background
-        newrank='true'  # Enable new ranking algorithm for better control
-    )
+# Preformatted DOT attribute lists for the flowchart
+_NODE_ATTRS: dict[tuple[int, bool, bool, bool], str] = {
+    key: f'color="{border}" fillcolor="{bg}" fontcolor="{font}" penwidth={penwidth}'
+    for key, (bg, border, font, penwidth) in _STYLE_TABLE.items()
+}
+_EDGE_ATTRS: dict[tuple[bool, bool, bool], str] = {
+    key: f'color="{color}" penwidth={penwidth}' for key, (color, penwidth) in _EDGE_STYLES.items()
+}
+# Lighter gray label text for dark background
+_SEMESTER_LABEL_ATTRS = 'fontcolor="#9CA3AF" fontname="Arial Bold" fontsize=12 shape=plaintext'
 
-    # Default node attributes
-    dot.attr('node',
-        shape='box',
-        style='filled,rounded',
-        fontname='Arial',
-        fontsize='11',
-        margin='0.15,0.1'
-    )
 
-    # Default edge attributes
-    dot.attr('edge',
-        color='#9CA3AF',  # Lighter gray for dark background
-        arrowsize='0.7'
-    )
+def _dot_quote(text: str) -> str:
+    """Quote a string as a DOT ID exactly as graphviz.Digraph would (only when needed)."""
+    return graphviz.quoting.quote(str(text))
+
+
+# Course count above which the flowchart collapses semesters into summary nodes
+MAX_FLOWCHART_NODES = 300
+
+
+def build_flowchart_source(
+    program_data: dict,
+    metrics: dict,
+    index: ProgramIndex,
+    selected_course: Optional[str] = None,
+    show_critical_path: bool = False,
+    splines: str = "line",
+    max_nodes: Optional[int] = MAX_FLOWCHART_NODES
+) -> str:
+    """Build the Graphviz DOT source for the program flowchart.
+
+    The DOT text is written directly rather than through graphviz.Digraph,
+    which formats and quotes attributes one node/edge call at a time.
+    splines sets Graphviz edge routing: straight "line" edges lay out much
+    faster than "ortho", which is the most expensive routing mode.
+
+    Programs with more than max_nodes courses (None means no limit) show
+    each semester as a single summary node, except the semester containing
+    the selected course. When the critical path is shown, critical courses
+    are still drawn individually next to their semester's summary node.
+    """
+    lines = [
+        f"// {program_data['major']}",
+        "digraph {",
+        # Graph attributes for top-to-bottom layout; background matches
+        # Streamlit dark mode
+        f'\tbgcolor="#0e1117" nodesep=0.4 rankdir=TB ranksep=0.6 splines={splines}',
+        # Default node attributes
+        '\tnode [fontname=Arial fontsize=11 margin="0.15,0.1" shape=box style="filled,rounded"]',
+        # Default edge attributes (lighter gray for dark background)
+        '\tedge [arrowsize=0.7 color="#9CA3AF"]',
+    ]
 
     courses = program_data["courses"]
-    course_map = {c["id"]: c for c in courses}
 
     # Group courses by semester
     semesters = {}
@@ -248,104 +604,174 @@ def create_flowchart(
 
     sorted_semesters = sorted(semesters.keys())
 
+    # Fold courses into per-semester summary nodes to bound the size of
+    # large charts; highlighted critical courses stay visible on their own
+    collapsed_courses = set()
+    if max_nodes is not None and len(courses) > max_nodes:
+        for sem, sem_courses in semesters.items():
+            if any(course["id"] == selected_course for course in sem_courses):
+                continue
+            collapsed_courses.update(
+                course["id"] for course in sem_courses
+                if not (show_critical_path and metrics.get(course["id"], {}).get("is_critical", False))
+            )
+
+    # DOT node ID for each course: its quoted ID, or its semester's summary node
+    node_ids = {
+        course_id: (
+            f"sem_summary_{course['semester']}" if course_id in collapsed_courses
+            else _dot_quote(course_id)
+        )
+        for course_id, course in index.course_map.items()
+    }
+
+    # Semesters with a prerequisite edge into the next semester's row; that
+    # edge already ranks the rows in order, so no invisible edge is needed
+    next_semester = dict(zip(sorted_semesters, sorted_semesters[1:]))
+    linked_semesters = set()
+    for course_id, prereq_ids in index.prereq_map.items():
+        course_sem = index.course_map[course_id]["semester"]
+        for prereq_id in prereq_ids:
+            prereq_sem = index.course_map[prereq_id]["semester"]
+            if next_semester.get(prereq_sem) == course_sem:
+                linked_semesters.add(prereq_sem)
+
     # Create semester label nodes and invisible edges to enforce row ordering
     for i, sem in enumerate(sorted_semesters):
-        # Create semester label node
-        sem_label_id = f"sem_label_{sem}"
-        dot.node(
-            sem_label_id,
-            label=f"Semester {sem}",
-            shape='plaintext',
-            fontname='Arial Bold',
-            fontsize='12',
-            fontcolor='#9CA3AF'  # Lighter gray for dark background
-        )
+        lines.append(f'\tsem_label_{sem} [label="Semester {sem}" {_SEMESTER_LABEL_ATTRS}]')
 
         # Create invisible edge to next semester to enforce ordering
-        if i < len(sorted_semesters) - 1:
-            next_sem = sorted_semesters[i + 1]
-            next_sem_label_id = f"sem_label_{next_sem}"
-            dot.edge(sem_label_id, next_sem_label_id, style='invis')
+        if i < len(sorted_semesters) - 1 and sem not in linked_semesters:
+            lines.append(f"\tsem_label_{sem} -> sem_label_{sorted_semesters[i + 1]} [style=invis]")
 
     # Create subgraphs for each semester to enforce ranking
     for sem in sorted_semesters:
-        with dot.subgraph() as s:
-            s.attr(rank='same')
-
-            # Include semester label in this rank
-            sem_label_id = f"sem_label_{sem}"
-            s.node(sem_label_id)
-
-            for course in semesters[sem]:
-                course_id = course["id"]
-                course_metrics = metrics.get(course_id, {})
-                is_critical = course_metrics.get("is_critical", False)
-
-                # Determine node styling
-                bg_color = get_semester_color(sem)
-                border_color = "#6B7280"  # Medium gray for dark background
-                font_color = "#333333"
-                penwidth = "1"
-
-                # Highlight selected course
-                if selected_course and course_id == selected_course:
-                    border_color = "#FE5C00"  # OSU Orange
-                    penwidth = "3"
-
-                # Dim non-critical courses if critical path is shown
-                if show_critical_path and not is_critical:
-                    bg_color = "#374151"  # Dark gray for dark background
-                    font_color = "#9CA3AF"  # Light gray text
-                    border_color = "#4B5563"
-                elif show_critical_path and is_critical:
-                    border_color = "#EF4444"  # Red for critical path
-                    penwidth = "2"
-
-                # Create label with course info
-                label = f"{course_id}\\n{course['name']}\\n({course['credits']} cr)"
-
-                s.node(
-                    course_id,
-                    label=label,
-                    fillcolor=bg_color,
-                    color=border_color,
-                    fontcolor=font_color,
-                    penwidth=penwidth
-                )
-
-    # Add edges for prerequisites
-    for course in courses:
-        course_id = course["id"]
-        for prereq_id in course.get("prerequisites", []):
-            if prereq_id in course_map:
-                edge_color = "#9CA3AF"  # Lighter gray for dark background
-                penwidth = "1"
-
-                # Highlight edges connected to selected course
-                if selected_course and (course_id == selected_course or prereq_id == selected_course):
-                    edge_color = "#FE5C00"  # OSU Orange
-                    penwidth = "2"
+        sem_idx = _semester_color_index(sem)
+
+        # Include semester label in this rank
+        lines.append("\t{")
+        lines.append("\t\trank=same")
+        lines.append(f"\t\tsem_label_{sem}")
+
+        collapsed_count = sum(course["id"] in collapsed_courses for course in semesters[sem])
+        if collapsed_count:
+            attrs = _NODE_ATTRS[(sem_idx, False, False, show_critical_path)]
+            more = "" if collapsed_count == len(semesters[sem]) else " more"
+            label = f"Semester {sem}\\n({collapsed_count}{more} courses)"
+            lines.append(f'\t\tsem_summary_{sem} [label="{label}" {attrs} style="filled,rounded,dashed"]')
+
+        for course in semesters[sem]:
+            course_id = course["id"]
+            if course_id in collapsed_courses:
+                continue
+            is_critical = bool(metrics.get(course_id, {}).get("is_critical", False))
+
+            # Node styling
+            attrs = _NODE_ATTRS[(sem_idx, is_critical, course_id == selected_course, show_critical_path)]
+
+            # Create label with course info
+            label = f"{course_id}\\n{course['name']}\\n({course['credits']} cr)"
+            lines.append(f"\t\t{node_ids[course_id]} [label={_dot_quote(label)} {attrs}]")
+
+        lines.append("\t}")
+
+    # Edges touching the selected course, and edges between two critical courses
+    selected_edges: set[tuple[str, str]] = set()
+    if selected_course in index.course_map:
+        selected_edges.update((p, selected_course) for p in index.prereq_map[selected_course])
+        selected_edges.update((selected_course, d) for d in index.dependents_map[selected_course])
+
+    critical_edges: set[tuple[str, str]] = set()
+    if show_critical_path:
+        critical_edges = {
+            (prereq_id, course_id)
+            for course_id, prereq_ids in index.prereq_map.items()
+            if metrics.get(course_id, {}).get("is_critical", False)
+            for prereq_id in prereq_ids
+            if metrics.get(prereq_id, {}).get("is_critical", False)
+        }
 
-                # Highlight critical path edges
-                if show_critical_path:
-                    prereq_critical = metrics.get(prereq_id, {}).get("is_critical", False)
-                    course_critical = metrics.get(course_id, {}).get("is_critical", False)
-                    if prereq_critical and course_critical:
-                        edge_color = "#EF4444"  # Red for critical path
-                        penwidth = "2"
-                    elif not prereq_critical or not course_critical:
-                        edge_color = "#4B5563"  # Dimmed gray for dark background
+    # Add edges for prerequisites; edges into or out of a summary node are
+    # merged, and highlighted if any edge they stand for is
+    summary_edges: dict[tuple[str, str], tuple[bool, bool]] = {}
+    for course_id, prereq_ids in index.prereq_map.items():
+        course_node = node_ids[course_id]
+        course_collapsed = course_id in collapsed_courses
+        for prereq_id in prereq_ids:
+            edge = (prereq_id, course_id)
+            is_selected = edge in selected_edges
+            is_critical = edge in critical_edges
+            prereq_node = node_ids[prereq_id]
+
+            if course_collapsed or prereq_id in collapsed_courses:
+                if prereq_node != course_node:
+                    was_selected, was_critical = summary_edges.get((prereq_node, course_node), (False, False))
+                    summary_edges[(prereq_node, course_node)] = (
+                        was_selected or is_selected,
+                        was_critical or is_critical
+                    )
+                continue
+
+            edge_attrs = _EDGE_ATTRS[(show_critical_path, is_selected, is_critical)]
+            lines.append(f"\t{prereq_node} -> {course_node} [{edge_attrs}]")
+
+    for (prereq_node, course_node), (is_selected, is_critical) in summary_edges.items():
+        edge_attrs = _EDGE_ATTRS[(show_critical_path, is_selected, is_critical)]
+        lines.append(f"\t{prereq_node} -> {course_node} [{edge_attrs}]")
+
+    lines.append("}")
+    return "\n".join(lines) + "\n"
+
+
+@st.cache_data
+def _cached_flowchart_source(
+    source_key: tuple,
+    _program_data: dict,
+    _metrics: dict,
+    _index: ProgramIndex,
+    selected_course: Optional[str],
+    show_critical_path: bool,
+    splines: str,
+    max_nodes: Optional[int]
+) -> str:
+    """Cached build_flowchart_source, keyed by source_key instead of the program data."""
+    return build_flowchart_source(
+        _program_data, _metrics, _index, selected_course, show_critical_path, splines, max_nodes
+    )
 
-                dot.edge(prereq_id, course_id, color=edge_color, penwidth=penwidth)
 
-    return dot
+def create_flowchart(
+    program_data: dict,
+    metrics: dict,
+    index: ProgramIndex,
+    selected_course: Optional[str] = None,
+    show_critical_path: bool = False,
+    source_key: Optional[tuple] = None,
+    splines: str = "line",
+    max_nodes: Optional[int] = MAX_FLOWCHART_NODES
+) -> graphviz.Source:
+    """Create a Graphviz flowchart for the program.
+
+    source_key identifies the program contents (e.g. filename and modification
+    time). When given, the DOT source is cached across reruns so unrelated
+    widget changes skip rebuilding it.
+    """
+    if source_key is None:
+        dot_source = build_flowchart_source(
+            program_data, metrics, index, selected_course, show_critical_path, splines, max_nodes
+        )
+    else:
+        dot_source = _cached_flowchart_source(
+            source_key, program_data, metrics, index, selected_course, show_critical_path, splines, max_nodes
+        )
+    return graphviz.Source(dot_source)
 
 
-def display_course_details(course: dict, metrics: dict, all_courses: list[dict]):
+def display_course_details(course: dict, metrics: dict, index: ProgramIndex):
     """Display detailed information about a selected course."""
     course_id = course["id"]
     course_metrics = metrics.get(course_id, {})
-    course_map = {c["id"]: c for c in all_courses}
+    course_map = index.course_map
 
     st.subheader(f"📖 {course_id}")
     st.markdown(f"**{course['name']}**")
@@ -398,6 +824,124 @@ def display_course_details(course: dict, metrics: dict, all_courses: list[dict])
         st.error("⚠️ This course is on the CRITICAL PATH. Delaying it will extend graduation time.")
 
 
+@st.cache_data
+def build_course_options(filename: str, mtime: float) -> list[str]:
+    """Build the course selection dropdown options for a program file.
+
+    Courses are sorted naturally by ID; the list is cached per file and
+    modification time.
+    """
+    courses = _read_program_file(filename, mtime)["courses"]
+    return ["None"] + [f"{c['id']} - {c['name']}" for c in sorted(courses, key=lambda x: natural_sort_key(x['id']))]
+
+
+@st.fragment
+def flowchart_panel(program_data: dict, metrics: dict, index: ProgramIndex, program_key: tuple):
+    """Flowchart controls, legend, flowchart and course details.
+
+    Runs as a fragment, so changing its widgets reruns only this panel and
+    skips program loading and metrics calculation in the page above it.
+    """
+    course_map = index.course_map
+
+    # Flowchart controls section
+    st.markdown("#### Course Flowchart")
+
+    ctrl_col1, ctrl_col2, ctrl_col3, ctrl_col4 = st.columns([2, 1, 1, 1])
+
+    with ctrl_col1:
+        # Course selection
+        course_options = build_course_options(*program_key)
+        selected_course_str = st.selectbox(
+            "Select Course for Details",
+            options=course_options,
+            index=0
+        )
+
+    with ctrl_col2:
+        st.markdown("")  # Spacing to align with selectbox
+        show_critical = st.checkbox("Highlight Critical Path", value=False)
+
+    with ctrl_col3:
+        st.markdown("")  # Spacing to align with selectbox
+        show_legend = st.checkbox("Show Legend", value=False)
+
+    with ctrl_col4:
+        st.markdown("")  # Spacing to align with selectbox
+        # Orthogonal edge routing is much slower to lay out than straight lines
+        orthogonal_edges = st.checkbox("Orthogonal Edges", value=False)
+
+    # Large programs show most semesters as summary nodes unless opted out
+    max_nodes = MAX_FLOWCHART_NODES
+    if len(course_map) > MAX_FLOWCHART_NODES:
+        if st.checkbox(
+            f"Show all {len(course_map)} courses",
+            value=False,
+            help=(
+                "Semesters without the selected course are collapsed; "
+                "highlighted critical courses stay visible."
+            )
+        ):
+            max_nodes = None
+
+    selected_course_id = None
+    if selected_course_str != "None":
+        selected_course_id = selected_course_str.split(" - ")[0]
+
+    # Legend
+    if show_legend:
+        legend_cols = st.columns(8)
+        for i, col in enumerate(legend_cols):
+            sem = i + 1
+            bg_color, text_color = get_semester_style(sem)
+            col.markdown(
+                f'<div style="background-color: {bg_color}; color: {text_color}; '
+                f'padding: 0.3125rem; text-align: center; border-radius: 0.25rem; font-size: 0.75rem;">'
+                f'Sem {sem}</div>',
+                unsafe_allow_html=True
+            )
+        st.markdown("")
+
+    # Main content area - flowchart and details
+    if selected_course_id and selected_course_id in course_map:
+        col1, col2 = st.columns([3, 1])
+    else:
+        col1, col2 = st.columns([1, 0.001])
+
+    with col1:
+        # Reuse the last flowchart when none of its inputs changed (e.g. only
+        # the legend was toggled); otherwise create it and remember it
+        splines = "ortho" if orthogonal_edges else "line"
+        flowchart_key = (*program_key, selected_course_id, show_critical, splines, max_nodes)
+        cached_flowchart = st.session_state.get("flowchart_cache")
+        if cached_flowchart is not None and cached_flowchart[0] == flowchart_key:
+            flowchart_source = cached_flowchart[1]
+        else:
+            flowchart = create_flowchart(
+                program_data,
+                metrics,
+                index,
+                selected_course=selected_course_id,
+                show_critical_path=show_critical,
+                source_key=program_key,
+                splines=splines,
+                max_nodes=max_nodes
+            )
+            flowchart_source = flowchart.source
+            st.session_state.flowchart_cache = (flowchart_key, flowchart_source)
+
+        st.graphviz_chart(flowchart_source, width="stretch")
+
+    # Course details panel
+    if selected_course_id and selected_course_id in course_map:
+        with col2:
+            display_course_details(
+                course_map[selected_course_id],
+                metrics,
+                index
+            )
+
+
 def flowchart_viewer_page():
     """Flowchart viewer page."""
 
@@ -406,7 +950,7 @@ def flowchart_viewer_page():
     st.markdown("Interactive visualization of degree program course progression and prerequisites.")
 
     # Load available programs
-    programs = get_available_programs()
+    programs = _cached_programs()
 
     if not programs:
         st.error("No program data files found. Please ensure JSON files are in the application directory.")
@@ -448,6 +992,11 @@ def flowchart_viewer_page():
         ]
         program_names = [p["major"] for p in programs_for_dept]
 
+        # First program for each major, for the lookup below
+        programs_by_major = {}
+        for p in programs_for_dept:
+            programs_by_major.setdefault(p["major"], p)
+
         with sel_col3:
             selected_major = st.selectbox(
                 "Degree Program",
@@ -456,9 +1005,9 @@ def flowchart_viewer_page():
             )
 
     # Find the selected program's filename
-    selected_program_data = next(
-        (p for p in programs_for_dept if p["major"] == selected_major),
-        programs_for_dept[0] if programs_for_dept else None
+    selected_program_data = (
+        programs_by_major.get(selected_major)
+        or next(iter(programs_by_major.values()), None)
     )
 
     if not selected_program_data:
@@ -466,12 +1015,21 @@ def flowchart_viewer_page():
         return
 
     # Load program data
-    program_data = load_program_data(selected_program_data["filename"])
+    program_file = selected_program_data["filename"]
+    try:
+        program_data = load_program_data(program_file)
+        # Identifies this version of the program for cached flowchart output
+        program_key = (program_file, os.path.getmtime(program_file))
+    except OSError as e:
+        # The file was removed or renamed after the program list was built
+        _forget_cached_programs()
+        st.error(f"Could not load {program_file}: {e}. The program list will be refreshed.")
+        return
     courses = program_data["courses"]
-    course_map = {c["id"]: c for c in courses}
+    index = build_program_index(courses)
 
     # Calculate metrics
-    metrics = calculate_critical_path(courses)
+    metrics = calculate_critical_path(index)
 
     # Program info header
     institution = program_data.get("institution", "")
@@ -499,75 +1057,30 @@ def flowchart_viewer_page():
 
     st.markdown("---")
 
-    # Flowchart controls section
-    st.markdown("#### Course Flowchart")
-
-    ctrl_col1, ctrl_col2, ctrl_col3, ctrl_col4 = st.columns([2, 1, 1, 1])
-
-    with ctrl_col1:
-        # Course selection
-        course_options = ["None"] + [f"{c['id']} - {c['name']}" for c in sorted(courses, key=lambda x: natural_sort_key(x['id']))]
-        selected_course_str = st.selectbox(
-            "Select Course for Details",
-            options=course_options,
-            index=0
-        )
-
-    with ctrl_col2:
-        st.markdown("")  # Spacing to align with selectbox
-        show_critical = st.checkbox("Highlight Critical Path", value=False)
+    flowchart_panel(program_data, metrics, index, program_key)
 
-    with ctrl_col3:
-        st.markdown("")  # Spacing to align with selectbox
-        show_legend = st.checkbox("Show Legend", value=False)
-
-    with ctrl_col4:
-        pass  # Empty column for spacing
 
-    selected_course_id = None
-    if selected_course_str != "None":
-        selected_course_id = selected_course_str.split(" - ")[0]
+def editor_course_frame(courses: list[dict]) -> pd.DataFrame:
+    """Return the course editor DataFrame, rebuilding it only when courses change.
 
-    # Legend
-    if show_legend:
-        legend_cols = st.columns(8)
-        for i, col in enumerate(legend_cols):
-            sem = i + 1
-            bg_color = get_semester_color(sem)
-            text_color = get_contrast_text_color(bg_color)
-            col.markdown(
-                f'<div style="background-color: {bg_color}; color: {text_color}; '
-                f'padding: 0.3125rem; text-align: center; border-radius: 0.25rem; font-size: 0.75rem;">'
-                f'Sem {sem}</div>',
-                unsafe_allow_html=True
-            )
-        st.markdown("")
+    The cached entry in session state keeps a reference to the courses list,
+    so an identity check catches a replaced list and the length check catches
+    appended courses.
+    """
+    cached = st.session_state.get("editor_df")
+    if cached is not None and cached[0] is courses and cached[1] == len(courses):
+        return cached[2]
 
-    # Main content area - flowchart and details
-    if selected_course_id and selected_course_id in course_map:
-        col1, col2 = st.columns([3, 1])
-    else:
-        col1, col2 = st.columns([1, 0.001])
+    course_df = pd.DataFrame(courses)
 
-    with col1:
-        # Create and display flowchart
-        flowchart = create_flowchart(
-            program_data,
-            metrics,
-            selected_course=selected_course_id,
-            show_critical_path=show_critical
+    # Convert prerequisites list to string for display
+    if "prerequisites" in course_df.columns:
+        course_df["prerequisites"] = course_df["prerequisites"].apply(
+            lambda x: ", ".join(x) if isinstance(x, list) else ""
         )
 
-        st.graphviz_chart(flowchart, width="stretch")
-
-    # Course details panel
-    if selected_course_id and selected_course_id in course_map:
-        with col2:
-            display_course_details(
-                course_map[selected_course_id],
-                metrics,
-                courses
-            )
+    st.session_state.editor_df = (courses, len(courses), course_df)
+    return course_df
 
 
 def editor_page():
@@ -593,7 +1106,7 @@ def editor_page():
 
         with load_col1:
             st.markdown("**Load Existing Degree Program**")
-            programs = get_available_programs()
+            programs = _cached_programs()
             if programs:
                 # Create display labels with institution/department context
                 program_options = ["-- New Degree Program --"] + [
@@ -629,14 +1142,21 @@ def editor_page():
                     else:
                         # Load selected program (index - 1 because of "-- New Degree Program --")
                         selected_program = programs[load_program_idx - 1]
-                        st.session_state.editor_data = load_program_data(selected_program["filename"])
-                        # Set filename to existing filename (without path and .json extension)
-                        existing_filename = Path(selected_program["filename"]).stem
-                        st.session_state.filename_input = existing_filename
-                        # Clear any exported JSON preview
-                        if "export_json" in st.session_state:
-                            del st.session_state.export_json
-                        st.rerun()
+                        try:
+                            program_data = load_program_data(selected_program["filename"])
+                        except OSError as e:
+                            # The file was removed or renamed after the program list was built
+                            _forget_cached_programs()
+                            st.error(f"Could not load {selected_program['filename']}: {e}")
+                        else:
+                            st.session_state.editor_data = program_data
+                            # Set filename to existing filename (without path and .json extension)
+                            existing_filename = Path(selected_program["filename"]).stem
+                            st.session_state.filename_input = existing_filename
+                            # Clear any exported JSON preview
+                            if "export_json" in st.session_state:
+                                del st.session_state.export_json
+                            st.rerun()
 
         with load_col2:
             st.markdown("**Import JSON File**")
@@ -646,7 +1166,7 @@ def editor_page():
                 file_id = f"{uploaded_file.name}_{uploaded_file.size}"
                 if st.session_state.get("last_uploaded_file") != file_id:
                     try:
-                        data = json.load(uploaded_file)
+                        data = _parse_json(uploaded_file.getvalue())
                         st.session_state.editor_data = data
                         st.session_state.last_uploaded_file = file_id
                         st.success("Data loaded successfully!")
@@ -683,13 +1203,7 @@ def editor_page():
 
     if data["courses"]:
         # Create DataFrame for editing
-        course_df = pd.DataFrame(data["courses"])
-
-        # Convert prerequisites list to string for display
-        if "prerequisites" in course_df.columns:
-            course_df["prerequisites"] = course_df["prerequisites"].apply(
-                lambda x: ", ".join(x) if isinstance(x, list) else ""
-            )
+        course_df = editor_course_frame(data["courses"])
 
         # Use data editor
         edited_df = st.data_editor(
@@ -774,7 +1288,7 @@ def editor_page():
     )
 
     final_filename = f"{export_filename}.json" if export_filename else "program-data.json"
-    json_data = json.dumps(data, indent=2)
+    json_data = _format_json(data)
 
     col1, col2, col3 = st.columns(3)
 
@@ -782,12 +1296,12 @@ def editor_page():
         if st.button("Save to Server", type="primary"):
             try:
                 save_path = f"data/{final_filename}"
-                with open(save_path, 'w') as f:
+                with open(save_path, 'w', encoding='utf-8') as f:
                     f.write(json_data)
                 st.success(f"Saved to {save_path}")
                 # Clear cached programs so the new file shows up
-                if "available_programs" in st.session_state:
-                    del st.session_state.available_programs
+                update_program_manifest(save_path, data)
+                _forget_cached_programs()
             except Exception as e:
                 st.error(f"Error saving file: {e}")
 
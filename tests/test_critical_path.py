@@ -0,0 +1,181 @@
+"""
+Tests for calculate_critical_path against a simple reference implementation.
+
+Run from the repository root with: python -m unittest discover tests
+"""
+
+import importlib
+import os
+import random
+import sys
+import tempfile
+import unittest
+from functools import lru_cache
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+app = None
+
+
+def setUpModule():
+    """Import app.py from an empty directory so its page code finds no programs."""
+    global app
+    sys.path.insert(0, str(REPO_ROOT))
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as empty_dir:
+        os.chdir(empty_dir)
+        try:
+            app = importlib.import_module("app")
+        finally:
+            os.chdir(cwd)
+
+
+def reference_metrics(courses: list[dict]) -> dict:
+    """Critical path metrics by brute force.
+
+    Courses that can reach each other through prerequisites (a cycle) are
+    merged into one node, then depth and height are the plain recursive
+    longest-chain lengths over the merged graph.
+    """
+    course_map = {c["id"]: c for c in courses}
+    prereqs = {
+        course_id: {p for p in course.get("prerequisites", []) if p in course_map}
+        for course_id, course in course_map.items()
+    }
+
+    # Everything each course unlocks, directly or indirectly (including itself)
+    reachable = {}
+    for course_id in course_map:
+        seen, stack = {course_id}, [course_id]
+        while stack:
+            current = stack.pop()
+            for other, other_prereqs in prereqs.items():
+                if current in other_prereqs and other not in seen:
+                    seen.add(other)
+                    stack.append(other)
+        reachable[course_id] = seen
+
+    component = {
+        course_id: frozenset(other for other in reachable[course_id] if course_id in reachable[other])
+        for course_id in course_map
+    }
+    component_prereqs = {
+        comp: {component[p] for member in comp for p in prereqs[member]} - {comp}
+        for comp in set(component.values())
+    }
+
+    @lru_cache(maxsize=None)
+    def depth(comp):
+        return max((depth(p) + 1 for p in component_prereqs[comp]), default=0)
+
+    @lru_cache(maxsize=None)
+    def height(comp):
+        return max(
+            (height(d) + 1 for d, d_prereqs in component_prereqs.items() if comp in d_prereqs),
+            default=0
+        )
+
+    lengths = {
+        course_id: (depth(component[course_id]), height(component[course_id]))
+        for course_id in course_map
+    }
+    critical_length = max((d + h for d, h in lengths.values()), default=0)
+    return {
+        course_id: {
+            "depth": d,
+            "height": h,
+            "earliest_semester": d + 1,
+            "path_length": d + h,
+            "is_critical": d + h == critical_length
+        }
+        for course_id, (d, h) in lengths.items()
+    }
+
+
+def critical_path(courses: list[dict]) -> dict:
+    return app.calculate_critical_path(app.build_program_index(courses))
+
+
+class CalculateCriticalPathTest(unittest.TestCase):
+
+    def test_empty_program(self):
+        self.assertEqual(critical_path([]), {})
+
+    def test_chain(self):
+        courses = [
+            {"id": "A", "prerequisites": []},
+            {"id": "B", "prerequisites": ["A"]},
+            {"id": "C", "prerequisites": ["B"]},
+            {"id": "D", "prerequisites": []},
+        ]
+        metrics = critical_path(courses)
+        self.assertEqual(
+            [(metrics[c]["depth"], metrics[c]["height"]) for c in "ABCD"],
+            [(0, 2), (1, 1), (2, 0), (0, 0)]
+        )
+        self.assertEqual([metrics[c]["is_critical"] for c in "ABCD"], [True, True, True, False])
+
+    def test_self_loop(self):
+        courses = [
+            {"id": "A", "prerequisites": ["A"]},
+            {"id": "B", "prerequisites": ["A"]},
+        ]
+        self.assertEqual(critical_path(courses), reference_metrics(courses))
+        self.assertEqual(critical_path(courses)["A"]["depth"], 0)
+        self.assertEqual(critical_path(courses)["B"]["depth"], 1)
+
+    def test_two_course_cycle_with_dependent(self):
+        courses = [
+            {"id": "A", "prerequisites": ["B"]},
+            {"id": "B", "prerequisites": ["A"]},
+            {"id": "C", "prerequisites": ["B"]},
+        ]
+        metrics = critical_path(courses)
+        self.assertEqual(metrics, reference_metrics(courses))
+        # Both cycle members share their metrics
+        for course_id in "AB":
+            self.assertEqual((metrics[course_id]["depth"], metrics[course_id]["height"]), (0, 1))
+        self.assertEqual((metrics["C"]["depth"], metrics["C"]["height"]), (1, 0))
+
+    def test_duplicate_and_unknown_prerequisites(self):
+        courses = [
+            {"id": "A", "prerequisites": []},
+            {"id": "B", "prerequisites": ["A", "A", "MISSING"]},
+            {"id": "C", "prerequisites": ["B", "A", "B"]},
+        ]
+        metrics = critical_path(courses)
+        self.assertEqual(metrics, reference_metrics(courses))
+        self.assertEqual([metrics[c]["depth"] for c in "ABC"], [0, 1, 2])
+
+    def test_random_programs_match_reference(self):
+        rng = random.Random(7)
+        for _ in range(300):
+            n = rng.randint(1, 12)
+            ids = [f"C{i}" for i in range(n)]
+            courses = [
+                {"id": course_id, "prerequisites": rng.choices(ids + ["MISSING"], k=rng.randint(0, 3))}
+                for course_id in ids
+            ]
+            expected = reference_metrics(courses)
+            self.assertEqual(critical_path(courses), expected, courses)
+
+            # Results must not depend on the order courses are listed in
+            shuffled = courses[:]
+            rng.shuffle(shuffled)
+            self.assertEqual(critical_path(shuffled), expected, shuffled)
+
+    def test_random_acyclic_programs_match_reference(self):
+        rng = random.Random(11)
+        for _ in range(200):
+            n = rng.randint(1, 40)
+            ids = [f"C{i}" for i in range(n)]
+            courses = [
+                {"id": course_id, "prerequisites": rng.sample(ids[:i], rng.randint(0, min(i, 3)))}
+                for i, course_id in enumerate(ids)
+            ]
+            self.assertEqual(critical_path(courses), reference_metrics(courses), courses)
+
+
+if __name__ == "__main__":
+    unittest.main()